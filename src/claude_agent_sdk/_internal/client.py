@@ -11,7 +11,7 @@ from ..types import (
     HookMatcher,
     Message,
 )
-from .env import resolve_env
+from .env import _K_STREAM_CLOSE, resolve_env
 from .message_parser import parse_message
 from .query import Query
 from .transport import Transport
@@ -106,9 +106,11 @@ class InternalClient:
                 for name, agent_def in configured_options.agents.items()
             }
 
-        # Resolve stream_close_timeout from options.env
+        # Resolve stream_close_timeout from options.env, through the same
+        # helper ClaudeSDKClient.connect uses so both entry points share
+        # one set of resolution semantics.
         stream_close_timeout_ms_str = resolve_env(
-            "CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", configured_options.env, "60000"
+            _K_STREAM_CLOSE, configured_options.env, "60000"
         )
         stream_close_timeout = float(stream_close_timeout_ms_str) / 1000.0
 
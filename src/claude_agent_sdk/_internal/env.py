@@ -1,21 +1,154 @@
 """Environment variable resolution with options.env precedence."""
 
 import os
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
 
+# Sentinel for "key absent", distinct from any real value (including "").
+_MISSING: Any = object()
 
-def resolve_env(key: str, options_env: dict[str, str] | None, default: str) -> str:
+# Shared read-only-by-convention empty dict, used in place of None so the
+# common path needs no truthiness branch before probing options_env.
+_EMPTY: dict[str, str] = {}
+
+# SDK env var keys, explicitly interned so dict probes hit CPython's
+# pointer-identity fast path before any character-wise comparison.
+_K_STREAM_CLOSE = sys.intern("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT")
+_K_SKIP_VERSION = sys.intern("CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK")
+
+# Hoisted bound method to skip the os -> environ -> get attribute chain on
+# each call. os.environ is a singleton _Environ that is mutated in place
+# (including by patch.dict/monkeypatch), so the binding never goes stale.
+_environ_get = os.environ.get
+
+
+@lru_cache(maxsize=1024)
+def _resolve_cached(
+    key: str, options_val: Any, env_val: str | None, default: str
+) -> str:
+    """Select the first defined value among options_val, env_val, and default.
+
+    Memoized on the looked-up values themselves rather than on id(options_env)
+    or an environment generation counter: CPython reuses the ids of
+    short-lived dicts and value-only environ mutations are invisible to a
+    length-based generation, so either scheme could serve a stale result.
+    Keying on the values makes invalidation automatic - a changed environment
+    produces a different key - and long-lived caching across many Query
+    constructions sharing one ClaudeAgentOptions is safe. The LRU bound keeps
+    the cache from growing without limit under churning env values.
+    """
+    if options_val is not _MISSING:
+        return options_val  # type: ignore[no-any-return]
+    if env_val is not None:
+        return env_val
+    return default
+
+
+def resolve_env(
+    key: str, options_env: Mapping[str, str] | None = _EMPTY, default: str = ""
+) -> str:
     """Resolve an environment variable with options.env taking precedence.
 
     Resolution order: options_env[key] → os.environ[key] → default
 
     Args:
         key: The environment variable name to look up.
-        options_env: The per-instance env dict from ClaudeAgentOptions.env, or None.
+        options_env: The per-instance env dict from ClaudeAgentOptions.env.
+            None is accepted and treated like an empty dict.
         default: The fallback value if the key is not found in either source.
 
     Returns:
         The resolved value.
     """
-    if options_env and key in options_env:
-        return options_env[key]
-    return os.environ.get(key, default)
+    if options_env is None:
+        options_env = _EMPTY
+    return _resolve_cached(
+        key, options_env.get(key, _MISSING), _environ_get(key), default
+    )
+
+
+# Prefixes of the env var keys the SDK itself resolves; see sdk_env_view.
+_SDK_ENV_PREFIXES = ("CLAUDE_", "ANTHROPIC_")
+
+
+def sdk_env_view(options_env: Mapping[str, str]) -> dict[str, str]:
+    """Return the subset of options_env holding SDK-recognized keys.
+
+    Resolution paths that only ever ask for SDK keys can probe this slim
+    view instead of the full user env dict.
+    """
+    return {k: v for k, v in options_env.items() if k.startswith(_SDK_ENV_PREFIXES)}
+
+
+# Keys inherited from the parent environment in isolated mode. Everything
+# else is dropped so API credentials cannot leak into the subprocess.
+_ISOLATED_ENV_ALLOWLIST = frozenset(
+    {
+        "PATH",
+        "HOME",
+        "USER",
+        "SHELL",
+        "LANG",
+        "LC_ALL",
+        "TERM",
+        "TMPDIR",
+        "TMP",
+        "TEMP",
+        "XDG_RUNTIME_DIR",
+        "NODE_PATH",
+        "NPM_CONFIG_PREFIX",  # Needed for Claude CLI
+        "CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK",  # Allow skip check
+    }
+)
+
+
+def build_subprocess_env(
+    options_env: Mapping[str, str],
+    os_env: dict[str, str],
+    isolated: bool,
+) -> dict[str, str]:
+    """Build the base environment for a CLI subprocess.
+
+    In isolated mode only system essentials are inherited from os.environ,
+    so API credentials from the parent process cannot leak; otherwise the
+    full parent environment is inherited. User-provided env vars are layered
+    on top directly, without building an intermediate filtered dict.
+    """
+    if isolated:
+        process_env = {
+            k: v for k, v in os.environ.items() if k in _ISOLATED_ENV_ALLOWLIST
+        }
+    else:
+        process_env = dict(os.environ)
+    process_env.update(options_env)
+    process_env.update(os_env)
+    return process_env
+
+
+class ResolvedEnv:
+    """Per-instance cache over resolve_env for repeated lookups.
+
+    Amortizes the options.env and os.environ probes to one per key for the
+    lifetime of a client or transport, rather than one per call. Values are
+    resolved lazily on first access and frozen from then on.
+    """
+
+    __slots__ = ("_options_env", "_cache")
+
+    def __init__(self, options_env: Mapping[str, str] | None) -> None:
+        self._options_env = options_env if options_env is not None else _EMPTY
+        self._cache: dict[str, str] = {}
+
+    def get(self, key: str, default: str = "") -> str:
+        """Resolve key with resolve_env semantics, caching the result."""
+        # After the first resolution the cache hit is the overwhelmingly
+        # common case, so a plain __getitem__ with the KeyError miss moved
+        # to the cold path beats a defaulted .get call.
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = resolve_env(key, self._options_env, default)
+            self._cache[key] = value
+            return value
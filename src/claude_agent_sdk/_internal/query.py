@@ -23,6 +23,7 @@ from ..types import (
     SDKHookCallbackRequest,
     ToolPermissionContext,
 )
+from .env import _K_STREAM_CLOSE
 from .transport import Transport
 
 if TYPE_CHECKING:
@@ -30,6 +31,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Pre-parsed default for CLAUDE_CODE_STREAM_CLOSE_TIMEOUT (60000 ms), so the
+# common unset-env path skips the float parse and ms->s conversion entirely.
+_DEFAULT_STREAM_CLOSE_TIMEOUT_S = 60.0
+
 
 def _convert_hook_output_for_cli(hook_output: dict[str, Any]) -> dict[str, Any]:
     """Convert Python-safe field names to CLI-expected field names.
@@ -119,10 +124,12 @@ class Query:
             self._stream_close_timeout = stream_close_timeout
         else:
             # Backward compat: fall back to os.environ when no value passed
+            raw_timeout_ms = os.environ.get(_K_STREAM_CLOSE)
             self._stream_close_timeout = (
-                float(os.environ.get("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", "60000"))
-                / 1000.0
-            )  # Convert ms to seconds
+                _DEFAULT_STREAM_CLOSE_TIMEOUT_S
+                if raw_timeout_ms is None
+                else float(raw_timeout_ms) / 1000.0  # Convert ms to seconds
+            )
 
     async def initialize(self) -> dict[str, Any] | None:
         """Initialize control protocol if in streaming mode.
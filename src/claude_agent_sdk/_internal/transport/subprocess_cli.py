@@ -22,7 +22,7 @@ from ..._errors import CLIConnectionError, CLINotFoundError, ProcessError
 from ..._errors import CLIJSONDecodeError as SDKJSONDecodeError
 from ..._version import __version__
 from ...types import ClaudeAgentOptions
-from ..env import resolve_env
+from ..env import _K_SKIP_VERSION, ResolvedEnv, build_subprocess_env, sdk_env_view
 from . import Transport
 
 logger = logging.getLogger(__name__)
@@ -63,6 +63,7 @@ class SubprocessCLITransport(Transport):
             else _DEFAULT_MAX_BUFFER_SIZE
         )
         self._write_lock: anyio.Lock = anyio.Lock()
+        self._resolved_env = ResolvedEnv(sdk_env_view(options.env))
         self._applied_os_env_keys: set[str] = set()
         self._os_env_previous_values: dict[str, str | None] = {}
 
@@ -344,45 +345,16 @@ class SubprocessCLITransport(Transport):
 
         self._apply_os_env_overrides()
 
-        if not resolve_env(
-            "CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK", self._options.env, ""
-        ):
+        if not self._resolved_env.get(_K_SKIP_VERSION, ""):
             await self._check_claude_version()
 
         cmd = self._build_command()
         try:
-            # Build process environment with optional isolation
-            if self._options.isolated:
-                # Isolated mode: Start with minimal env (only system essentials)
-                # This prevents API credentials from parent process leaking
-                process_env = {
-                    k: v
-                    for k, v in os.environ.items()
-                    if k
-                    in (
-                        "PATH",
-                        "HOME",
-                        "USER",
-                        "SHELL",
-                        "LANG",
-                        "LC_ALL",
-                        "TERM",
-                        "TMPDIR",
-                        "TMP",
-                        "TEMP",
-                        "XDG_RUNTIME_DIR",
-                        "NODE_PATH",
-                        "NPM_CONFIG_PREFIX",  # Needed for Claude CLI
-                        "CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK",  # Allow skip check
-                    )
-                }
-            else:
-                # Standard mode: Inherit full parent environment
-                process_env = dict(os.environ)
-
-            # Layer 1: Apply user-provided env vars
-            process_env.update(self._options.env)
-            process_env.update(self._options.os_env)
+            # Layer 1: Parent environment (allow-listed in isolated mode)
+            # plus user-provided env vars
+            process_env = build_subprocess_env(
+                self._options.env, self._options.os_env, self._options.isolated
+            )
 
             # Layer 2: SDK-required vars (not API-sensitive, safe to set)
             process_env["CLAUDE_CODE_ENTRYPOINT"] = self._entrypoint
@@ -7,7 +7,7 @@ from typing import Any
 
 from . import Transport
 from ._errors import CLIConnectionError
-from ._internal.env import resolve_env
+from ._internal.env import _K_STREAM_CLOSE, resolve_env
 from .types import (
     ClaudeAgentOptions,
     HookEvent,
@@ -151,9 +151,7 @@ class ClaudeSDKClient:
 
         # Calculate initialize timeout from CLAUDE_CODE_STREAM_CLOSE_TIMEOUT env var if set
         # CLAUDE_CODE_STREAM_CLOSE_TIMEOUT is in milliseconds, convert to seconds
-        stream_close_timeout_ms_str = resolve_env(
-            "CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", options.env, "60000"
-        )
+        stream_close_timeout_ms_str = resolve_env(_K_STREAM_CLOSE, options.env, "60000")
         stream_close_timeout_ms = int(stream_close_timeout_ms_str)
         initialize_timeout = max(stream_close_timeout_ms / 1000.0, 60.0)
         stream_close_timeout = stream_close_timeout_ms / 1000.0
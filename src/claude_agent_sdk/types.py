@@ -1,9 +1,10 @@
 """Type definitions for Claude SDK."""
 
 import sys
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Literal, TypedDict
 
 from typing_extensions import NotRequired
@@ -972,7 +973,7 @@ class ThinkingConfigDisabled(TypedDict):
 ThinkingConfig = ThinkingConfigAdaptive | ThinkingConfigEnabled | ThinkingConfigDisabled
 
 
-@dataclass
+@dataclass(slots=True)
 class ClaudeAgentOptions:
     """Query options for Claude SDK."""
 
@@ -995,7 +996,9 @@ class ClaudeAgentOptions:
     cli_path: str | Path | None = None
     settings: str | None = None
     add_dirs: list[str | Path] = field(default_factory=list)
-    env: dict[str, str] = field(default_factory=dict)
+    # Wrapped in a read-only MappingProxyType at construction so it can be
+    # shared across queries and threads without defensive copies.
+    env: Mapping[str, str] = field(default_factory=dict)
     # Optional process-level env overrides applied to `os.environ` while a
     # transport is connected. Use this only for integrations that explicitly
     # require process-level env lookup (for example, SDK MCP tools/hooks that
@@ -1053,6 +1056,12 @@ class ClaudeAgentOptions:
     # using `ClaudeSDKClient.rewind_files()`.
     enable_file_checkpointing: bool = False
 
+    def __post_init__(self) -> None:
+        # Freeze env behind a C-level read-only view; downstream code can
+        # then share it without copying. dict(...) re-snapshots the caller's
+        # dict so later mutations of it cannot leak in either.
+        self.env = MappingProxyType(dict(self.env))
+
 
 # SDK Control Protocol
 class SDKControlInterruptRequest(TypedDict):
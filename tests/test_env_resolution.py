@@ -1,63 +1,95 @@
 """Tests for environment variable resolution with options.env precedence."""
 
-import os
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
-from claude_agent_sdk._internal.env import resolve_env
+import pytest
+
+from claude_agent_sdk._internal.env import ResolvedEnv, resolve_env
 
 
 class TestResolveEnv:
     """Unit tests for resolve_env function."""
 
-    def test_options_env_wins_over_os_environ(self) -> None:
+    def test_options_env_wins_over_os_environ(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """options.env value takes precedence over os.environ."""
         options_env = {"MY_VAR": "from_options"}
-        with patch.dict(os.environ, {"MY_VAR": "from_environ"}):
-            result = resolve_env("MY_VAR", options_env, "default_val")
+        monkeypatch.setenv("MY_VAR", "from_environ")
+        result = resolve_env("MY_VAR", options_env, "default_val")
         assert result == "from_options"
 
-    def test_os_environ_fallback(self) -> None:
+    def test_os_environ_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Falls back to os.environ when key not in options_env."""
         options_env = {"OTHER_VAR": "irrelevant"}
-        with patch.dict(os.environ, {"MY_VAR": "from_environ"}):
-            result = resolve_env("MY_VAR", options_env, "default_val")
+        monkeypatch.setenv("MY_VAR", "from_environ")
+        result = resolve_env("MY_VAR", options_env, "default_val")
         assert result == "from_environ"
 
-    def test_default_fallback(self) -> None:
+    def test_default_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Falls back to default when key not in options_env or os.environ."""
         options_env = {"OTHER_VAR": "irrelevant"}
-        env_patch = {k: v for k, v in os.environ.items() if k != "MY_VAR"}
-        with patch.dict(os.environ, env_patch, clear=True):
-            result = resolve_env("MY_VAR", options_env, "default_val")
+        monkeypatch.delenv("MY_VAR", raising=False)
+        result = resolve_env("MY_VAR", options_env, "default_val")
         assert result == "default_val"
 
-    def test_none_options_env(self) -> None:
+    def test_none_options_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Works correctly when options_env is None."""
-        with patch.dict(os.environ, {"MY_VAR": "from_environ"}):
-            result = resolve_env("MY_VAR", None, "default_val")
+        monkeypatch.setenv("MY_VAR", "from_environ")
+        result = resolve_env("MY_VAR", None, "default_val")
         assert result == "from_environ"
 
-    def test_none_options_env_default_fallback(self) -> None:
+    def test_none_options_env_default_fallback(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Falls back to default when options_env is None and key not in os.environ."""
-        env_patch = {k: v for k, v in os.environ.items() if k != "MY_VAR"}
-        with patch.dict(os.environ, env_patch, clear=True):
-            result = resolve_env("MY_VAR", None, "default_val")
+        monkeypatch.delenv("MY_VAR", raising=False)
+        result = resolve_env("MY_VAR", None, "default_val")
         assert result == "default_val"
 
-    def test_empty_options_env(self) -> None:
+    def test_empty_options_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Falls back to os.environ when options_env is empty dict."""
-        with patch.dict(os.environ, {"MY_VAR": "from_environ"}):
-            result = resolve_env("MY_VAR", {}, "default_val")
+        monkeypatch.setenv("MY_VAR", "from_environ")
+        result = resolve_env("MY_VAR", {}, "default_val")
         assert result == "from_environ"
 
-    def test_empty_string_value_in_options_env(self) -> None:
+    def test_empty_string_value_in_options_env(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Empty string in options_env is a valid value (truthy check on 'in', not value)."""
         options_env = {"MY_VAR": ""}
-        with patch.dict(os.environ, {"MY_VAR": "from_environ"}):
-            result = resolve_env("MY_VAR", options_env, "default_val")
+        monkeypatch.setenv("MY_VAR", "from_environ")
+        result = resolve_env("MY_VAR", options_env, "default_val")
         assert result == ""
 
 
+class TestResolvedEnv:
+    """Unit tests for the ResolvedEnv per-instance cache."""
+
+    def test_options_env_wins_over_os_environ(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """ResolvedEnv honors options.env precedence like resolve_env."""
+        options_env = {"MY_VAR": "from_options"}
+        monkeypatch.setenv("MY_VAR", "from_environ")
+        resolved = ResolvedEnv(options_env)
+        assert resolved.get("MY_VAR", "default_val") == "from_options"
+
+    def test_caches_first_resolution(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Repeated lookups return the value resolved on first access."""
+        monkeypatch.setenv("MY_VAR", "first")
+        resolved = ResolvedEnv(None)
+        assert resolved.get("MY_VAR", "default_val") == "first"
+        monkeypatch.setenv("MY_VAR", "second")
+        assert resolved.get("MY_VAR", "default_val") == "first"
+
+    def test_default_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Falls back to default when key not in options_env or os.environ."""
+        monkeypatch.delenv("MY_VAR", raising=False)
+        resolved = ResolvedEnv(None)
+        assert resolved.get("MY_VAR", "default_val") == "default_val"
+
+
 class TestStreamCloseTimeoutResolution:
     """Integration-style tests for CLAUDE_CODE_STREAM_CLOSE_TIMEOUT resolution."""
 
@@ -70,31 +102,26 @@ class TestStreamCloseTimeoutResolution:
         result = resolve_env("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", options.env, "60000")
         assert result == "30000"
 
-    def test_stream_close_timeout_os_environ_fallback(self) -> None:
+    def test_stream_close_timeout_os_environ_fallback(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Falls back to os.environ for CLAUDE_CODE_STREAM_CLOSE_TIMEOUT."""
         from claude_agent_sdk.types import ClaudeAgentOptions
 
         options = ClaudeAgentOptions()  # empty env
-        with patch.dict(os.environ, {"CLAUDE_CODE_STREAM_CLOSE_TIMEOUT": "45000"}):
-            result = resolve_env(
-                "CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", options.env, "60000"
-            )
+        monkeypatch.setenv("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", "45000")
+        result = resolve_env("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", options.env, "60000")
         assert result == "45000"
 
-    def test_stream_close_timeout_default(self) -> None:
+    def test_stream_close_timeout_default(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Uses default when CLAUDE_CODE_STREAM_CLOSE_TIMEOUT not set anywhere."""
         from claude_agent_sdk.types import ClaudeAgentOptions
 
         options = ClaudeAgentOptions()
-        env_patch = {
-            k: v
-            for k, v in os.environ.items()
-            if k != "CLAUDE_CODE_STREAM_CLOSE_TIMEOUT"
-        }
-        with patch.dict(os.environ, env_patch, clear=True):
-            result = resolve_env(
-                "CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", options.env, "60000"
-            )
+        monkeypatch.delenv("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", raising=False)
+        result = resolve_env("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", options.env, "60000")
         assert result == "60000"
 
 
@@ -109,27 +136,26 @@ class TestSkipVersionCheckResolution:
         result = resolve_env("CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK", options.env, "")
         assert result == "1"
 
-    def test_skip_version_check_os_environ_fallback(self) -> None:
+    def test_skip_version_check_os_environ_fallback(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Falls back to os.environ for CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK."""
         from claude_agent_sdk.types import ClaudeAgentOptions
 
         options = ClaudeAgentOptions()
-        with patch.dict(os.environ, {"CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK": "true"}):
-            result = resolve_env("CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK", options.env, "")
+        monkeypatch.setenv("CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK", "true")
+        result = resolve_env("CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK", options.env, "")
         assert result == "true"
 
-    def test_skip_version_check_default_empty(self) -> None:
+    def test_skip_version_check_default_empty(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Default is empty string (falsy) for CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK."""
         from claude_agent_sdk.types import ClaudeAgentOptions
 
         options = ClaudeAgentOptions()
-        env_patch = {
-            k: v
-            for k, v in os.environ.items()
-            if k != "CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK"
-        }
-        with patch.dict(os.environ, env_patch, clear=True):
-            result = resolve_env("CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK", options.env, "")
+        monkeypatch.delenv("CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK", raising=False)
+        result = resolve_env("CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK", options.env, "")
         assert result == ""
         # Empty string is falsy, so version check should run
         assert not result
@@ -150,31 +176,26 @@ class TestQueryStreamCloseTimeout:
         )
         assert query._stream_close_timeout == 30.0
 
-    def test_query_falls_back_to_environ(self) -> None:
+    def test_query_falls_back_to_environ(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Query falls back to os.environ when stream_close_timeout is None."""
         from claude_agent_sdk._internal.query import Query
 
         mock_transport = AsyncMock()
-        with patch.dict(os.environ, {"CLAUDE_CODE_STREAM_CLOSE_TIMEOUT": "90000"}):
-            query = Query(
-                transport=mock_transport,
-                is_streaming_mode=True,
-            )
+        monkeypatch.setenv("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", "90000")
+        query = Query(
+            transport=mock_transport,
+            is_streaming_mode=True,
+        )
         assert query._stream_close_timeout == 90.0
 
-    def test_query_falls_back_to_default(self) -> None:
+    def test_query_falls_back_to_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Query uses 60s default when no stream_close_timeout and no env var."""
         from claude_agent_sdk._internal.query import Query
 
         mock_transport = AsyncMock()
-        env_patch = {
-            k: v
-            for k, v in os.environ.items()
-            if k != "CLAUDE_CODE_STREAM_CLOSE_TIMEOUT"
-        }
-        with patch.dict(os.environ, env_patch, clear=True):
-            query = Query(
-                transport=mock_transport,
-                is_streaming_mode=True,
-            )
+        monkeypatch.delenv("CLAUDE_CODE_STREAM_CLOSE_TIMEOUT", raising=False)
+        query = Query(
+            transport=mock_transport,
+            is_streaming_mode=True,
+        )
         assert query._stream_close_timeout == 60.0
@@ -1,8 +1,10 @@
 """Tests for options isolation and environment behavior."""
 
 import os
+from unittest.mock import patch
 
 from claude_agent_sdk import ClaudeAgentOptions
+from claude_agent_sdk._internal.env import build_subprocess_env
 
 
 class TestOptionFields:
@@ -34,6 +36,43 @@ class TestOptionFields:
         assert options.isolated is True
 
 
+class TestBuildSubprocessEnv:
+    """Test subprocess environment construction with and without isolation."""
+
+    def test_non_isolated_inherits_parent_env(self):
+        """Non-isolated mode inherits the full parent environment."""
+        with patch.dict(os.environ, {"SOME_PARENT_VAR": "parent-value"}):
+            process_env = build_subprocess_env({}, {}, isolated=False)
+        assert process_env["SOME_PARENT_VAR"] == "parent-value"
+
+    def test_isolated_drops_non_allowlisted_vars(self):
+        """Isolated mode drops parent vars that are not system essentials."""
+        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "parent-secret"}):
+            process_env = build_subprocess_env({}, {}, isolated=True)
+        assert "ANTHROPIC_API_KEY" not in process_env
+
+    def test_isolated_keeps_system_essentials(self):
+        """Isolated mode keeps allow-listed system vars like PATH."""
+        with patch.dict(os.environ, {"PATH": "/usr/bin"}):
+            process_env = build_subprocess_env({}, {}, isolated=True)
+        assert process_env["PATH"] == "/usr/bin"
+
+    def test_options_env_overrides_parent(self):
+        """User-provided env vars take precedence over inherited ones."""
+        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "parent-key"}):
+            process_env = build_subprocess_env(
+                {"ANTHROPIC_API_KEY": "options-key"}, {}, isolated=False
+            )
+        assert process_env["ANTHROPIC_API_KEY"] == "options-key"
+
+    def test_os_env_overrides_options_env(self):
+        """os_env is layered after env, matching the previous transport order."""
+        process_env = build_subprocess_env(
+            {"MY_VAR": "from_env"}, {"MY_VAR": "from_os_env"}, isolated=True
+        )
+        assert process_env["MY_VAR"] == "from_os_env"
+
+
 class TestEnvironmentIsolation:
     """Test that option creation never mutates global os.environ."""
 